@@ -3,11 +3,16 @@ Advanced LangChain RAG system
 Combines all components into a complete RAG pipeline
 """
 
-from typing import List, Optional
+import os
+from typing import Iterator, List, Optional
+
+import httpx
+from openai import APIError
 from langchain.schema import Document
 from langchain_document_processor import LangChainDocumentProcessor
 from langchain_vectorstore import LangChainVectorStore
 from langchain_openai_client import get_openai_client
+from semantic_cache import SemanticCache
 
 
 class AdvancedLangChainRAG:
@@ -19,6 +24,8 @@ class AdvancedLangChainRAG:
         chroma_path: str = "chroma",
         chunk_size: int = 600,
         chunk_overlap: int = 100,
+        cache_threshold: float = 0.97,
+        int8_matrix: bool = False,
     ):
 
         self.data_path = data_path
@@ -29,7 +36,12 @@ class AdvancedLangChainRAG:
             chunk_size=chunk_size, chunk_overlap=chunk_overlap
         )
         self.vectorstore = LangChainVectorStore(
-            persist_directory=chroma_path, collection_name="documents"
+            persist_directory=chroma_path,
+            collection_name="documents",
+            int8_matrix=int8_matrix,
+        )
+        self.query_cache = SemanticCache(
+            os.path.join(chroma_path, "_qcache.npz"), threshold=cache_threshold
         )
 
         # Prompt template
@@ -48,55 +60,119 @@ Answer:"""
             print("✨ Clearing Database")
             self.vectorstore.clear_database()
 
-        # Process documents
-        documents = self.document_processor.process_documents(self.data_path)
+        # Cached answers may be stale once the documents change
+        self.query_cache.clear()
+
+        # Stream chunk batches into the vector store while PDFs are parsed
+        total = self.vectorstore.create_vectorstore_from_batches(
+            self.document_processor.iter_chunk_batches(self.data_path)
+        )
 
-        if not documents:
+        if not total:
             print("❌ No documents found to process")
             return
 
-        # Create vector store
-        self.vectorstore.create_vectorstore(documents)
-        print(f"✅ Database populated with {len(documents)} document chunks")
+        print(f"✅ Database populated with {total} document chunks")
 
-    def query(self, query_text: str, model: str = "gpt-4.1-nano", k: int = 5) -> dict:
-        """Query the RAG system"""
+    def query(
+        self,
+        query_text: str,
+        model: str = "gpt-4.1-nano",
+        k: int = 5,
+        stream: bool = False,
+    ) -> dict:
+        """
+        Query the RAG system
+
+        With ``stream=True`` the "answer" entry is an iterator of tokens
+        """
+
+        # Reuse the answer of a previous, near-identical question
+        cache_namespace = f"{model}:{k}"
+        query_embedding = self.vectorstore.embedding_function.embed_query(query_text)
+        cached = self.query_cache.lookup(query_embedding, cache_namespace)
+        if cached is not None:
+            # Context is not cached, so hits carry it as None
+            cached["context"] = None
+            if stream:
+                cached["answer"] = iter([cached["answer"]])
+            return cached
 
         # Search for relevant documents
-        relevant_docs = self.vectorstore.similarity_search(query_text, k=k)
+        relevant_docs = self.vectorstore.similarity_search_by_vector(
+            query_embedding, k=k
+        )
 
         if not relevant_docs:
             return {"answer": "❌ No relevant documents found", "sources": []}
 
         # Format context
-        context_text = "\n\n---\n\n".join([doc.page_content for doc in relevant_docs])
+        context_text = "\n\n---\n\n".join(doc.page_content for doc in relevant_docs)
+        previews = [
+            text if len(text) <= 200 else text[:200] + "..."
+            for text in (doc.page_content for doc in relevant_docs)
+        ]
 
         # Create prompt
         prompt = self.prompt_template.format(context=context_text, question=query_text)
 
-        # Generate response using OpenAI
-        client = get_openai_client(model)
-
-        if not client.is_available():
-            return {"answer": "❌ OpenAI API not available", "sources": []}
-
-        response = client.generate(prompt)
-
         # Format sources
         sources = []
-        for i, doc in enumerate(relevant_docs, 1):
+        for i, (doc, preview) in enumerate(zip(relevant_docs, previews), 1):
             source_info = {
                 "index": i,
-                "content": (
-                    doc.page_content[:200] + "..."
-                    if len(doc.page_content) > 200
-                    else doc.page_content
-                ),
+                "content": preview,
                 "metadata": doc.metadata,
             }
             sources.append(source_info)
 
-        return {"answer": response, "sources": sources, "context": context_text}
+        # Generate response using OpenAI
+        client = get_openai_client(model)
+        result = {"answer": None, "sources": sources, "context": context_text}
+
+        if stream:
+            tokens = client.generate_stream(prompt)
+            result["answer"] = self._stream_answer(
+                tokens, result, query_embedding, cache_namespace
+            )
+            return result
+
+        try:
+            response = client.generate(prompt)
+        except (APIError, httpx.HTTPError):
+            return {"answer": "❌ OpenAI API not available", "sources": []}
+
+        result["answer"] = response
+        if not response.startswith("❌"):
+            self.query_cache.add(query_embedding, result, cache_namespace)
+        return result
+
+    def _stream_answer(
+        self,
+        tokens: Iterator[str],
+        result: dict,
+        query_embedding: List[float],
+        cache_namespace: str,
+    ) -> Iterator[str]:
+        """Yield answer tokens, caching the full answer once complete"""
+        parts = []
+        try:
+            for token in tokens:
+                parts.append(token)
+                yield token
+        except (APIError, httpx.HTTPError):
+            yield "❌ OpenAI API not available"
+            return
+        except Exception as e:
+            # A failed stream may be partial, so it is never cached
+            yield f"❌ Error calling OpenAI API: {e}"
+            return
+
+        response = "".join(parts).strip()
+        if response:
+            self.query_cache.add(
+                query_embedding, {**result, "answer": response}, cache_namespace
+            )
 
     def query_with_scores(
         self,
@@ -128,7 +204,11 @@ Answer:"""
         relevant_docs = [doc for doc, score in filtered_results]
 
         # Format context
-        context_text = "\n\n---\n\n".join([doc.page_content for doc in relevant_docs])
+        context_text = "\n\n---\n\n".join(doc.page_content for doc in relevant_docs)
+        previews = [
+            text if len(text) <= 200 else text[:200] + "..."
+            for text in (doc.page_content for doc in relevant_docs)
+        ]
 
         # Create prompt
         prompt = self.prompt_template.format(context=context_text, question=query_text)
@@ -136,21 +216,19 @@ Answer:"""
         # Generate response using OpenAI
         client = get_openai_client(model)
 
-        if not client.is_available():
+        try:
+            response = client.generate(prompt)
+        except (APIError, httpx.HTTPError):
             return {"answer": "❌ OpenAI API not available", "sources": []}
 
-        response = client.generate(prompt)
-
         # Format sources with scores
         sources = []
-        for i, (doc, score) in enumerate(filtered_results, 1):
+        for i, ((doc, score), preview) in enumerate(
+            zip(filtered_results, previews), 1
+        ):
             source_info = {
                 "index": i,
-                "content": (
-                    doc.page_content[:200] + "..."
-                    if len(doc.page_content) > 200
-                    else doc.page_content
-                ),
+                "content": preview,
                 "metadata": doc.metadata,
                 "relevance_score": float(score),
             }
@@ -3,22 +3,24 @@ Interactive CLI for the LangChain RAG system
 """
 
 import os
-from advanced_langchain_rag import AdvancedLangChainRAG
 
 
 def main():
     print("🤖 LangChain RAG System - Interactive Mode")
     print("=" * 50)
 
-    # Initialize RAG system
-    rag_system = AdvancedLangChainRAG()
-
     # Check if database exists
     if not os.path.exists("chroma"):
         print("❌ Database not found!")
         print("Please run: python populate_database.py")
         return
 
+    # Import lazily: LangChain, Chroma and torch take seconds to load
+    from advanced_langchain_rag import AdvancedLangChainRAG
+
+    # Initialize RAG system
+    rag_system = AdvancedLangChainRAG()
+
     print("✅ RAG system initialized")
     print("💡 Type 'quit' or 'exit' to stop")
     print("💡 Type 'reset' to clear and repopulate database")
@@ -43,13 +45,19 @@ def main():
 
             # Process query
             print("\n🤔 Thinking...")
-            result = rag_system.query(query)
+            result = rag_system.query(query, stream=True)
 
-            # Display results
+            # Display results, printing the answer as tokens arrive
             print("\n" + "=" * 50)
             print("🎯 ANSWER:")
             print("=" * 50)
-            print(result["answer"])
+            answer = result["answer"]
+            if isinstance(answer, str):
+                print(answer)
+            else:
+                for token in answer:
+                    print(token, end="", flush=True)
+                print()
 
             if result.get("sources"):
                 print("\n" + "=" * 30)
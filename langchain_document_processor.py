@@ -3,44 +3,263 @@ LangChain-based document processor
 Handles PDF loading and text splitting using LangChain components
 """
 
+import hashlib
+import multiprocessing
 import os
-from typing import List
-from langchain_community.document_loaders import PyPDFDirectoryLoader
+import platform
+import queue
+import re
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from langchain_community.document_loaders.blob_loaders import Blob
+from langchain_community.document_loaders.parsers.pdf import PyPDFParser
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
+# Rust-backed splitter, much faster on large pages; optional
+try:
+    from semantic_text_splitter import TextSplitter
+except ImportError:
+    TextSplitter = None
+
+
+def _prefetch(paths: List[str]):
+    """Ask the kernel to start reading all files ahead of parsing (Linux)"""
+    if platform.system() != "Linux" or not hasattr(os, "posix_fadvise"):
+        return
+
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _load_one(path: str) -> List[Document]:
+    """Load every page of a single PDF (runs in a worker process)"""
+    # One sequential read, then parse from memory instead of seeking the file
+    with open(path, "rb") as f:
+        data = f.read()
+    return PyPDFParser().parse(Blob.from_data(data, path=path))
+
+
+# Fewer PDFs than this are parsed in-process instead of in worker processes
+MIN_PARALLEL_FILES = 4
+
+# Word boundaries for the overlap of the fast splitter
+_WHITESPACE = re.compile(r"\s")
+
+
+def _fast_recursive_split(
+    text: str, size: int, overlap: int, seps: List[str]
+) -> List[str]:
+    """
+    Split text into chunks of at most ``size`` characters
+
+    Each chunk ends at the last occurrence of the highest-priority separator
+    in its window (hard cut if none), and the next chunk starts up to
+    ``overlap`` characters earlier, on a word boundary
+    """
+    chunks = []
+    start = 0
+    # Next cut must leave at least one new non-space character in the chunk
+    floor = 1
+    length = len(text)
+
+    while start < length:
+        end = start + size
+        cut = length if end >= length else end
+
+        if end < length:
+            lowest = max(start + 1, floor)
+            for sep in seps:
+                if not sep:
+                    continue
+                pos = text.rfind(sep, lowest, end)
+                if pos != -1:
+                    cut = pos
+                    break
+
+        chunk = text[start:cut].strip()
+        if chunk:
+            chunks.append(chunk)
+        if cut >= length:
+            break
+
+        next_start = cut - overlap
+        if next_start <= start:
+            next_start = cut
+        else:
+            # Only overlap whole words; drop the overlap if there are none
+            space = _WHITESPACE.search(text, next_start, cut)
+            next_start = space.end() if space else cut
+        start = next_start
+
+        floor = cut
+        while floor < length and text[floor].isspace():
+            floor += 1
+        floor += 1
+
+    return chunks
+
 
 class LangChainDocumentProcessor:
     """Process documents using LangChain components"""
 
-    def __init__(self, chunk_size: int = 600, chunk_overlap: int = 100):
+    def __init__(
+        self,
+        chunk_size: int = 600,
+        chunk_overlap: int = 100,
+        splitter: Optional[str] = None,
+    ):
+        """
+        ``splitter`` picks how pages longer than chunk_size are split:
+        "rust" (semantic-text-splitter), "fast" (built-in rfind-based) or
+        "langchain" (RecursiveCharacterTextSplitter). By default "rust" is
+        used when installed, otherwise "fast".
+        """
+        if splitter is None:
+            splitter = "rust" if TextSplitter else "fast"
+        if splitter not in ("rust", "fast", "langchain"):
+            raise ValueError(f"Unknown splitter: {splitter}")
+        if splitter == "rust" and TextSplitter is None:
+            raise ValueError("semantic-text-splitter is not installed")
+
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.splitter = splitter
+        self.separators = ["\n\n", "\n", " ", ""]
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""],
+            separators=self.separators,
+        )
+        self.rust_splitter = (
+            TextSplitter(chunk_size, overlap=chunk_overlap)
+            if splitter == "rust"
+            else None
         )
 
-    def load_documents(self, directory_path: str) -> List[Document]:
-        """Load all PDF documents from directory using LangChain"""
+    def _pdf_paths(self, directory_path: str) -> List[str]:
+        """List the PDF files to load from a directory"""
         if not os.path.exists(directory_path):
             raise ValueError(f"Directory {directory_path} does not exist")
 
-        # Use LangChain's PDF directory loader
-        loader = PyPDFDirectoryLoader(directory_path)
-        documents = loader.load()
+        # Skip hidden files and directories, like LangChain's PyPDFDirectoryLoader
+        root = Path(directory_path)
+        return sorted(
+            str(path)
+            for path in root.rglob("*.pdf")
+            if not any(part.startswith(".") for part in path.relative_to(root).parts)
+        )
+
+    def _iter_pages(self, paths: List[str]) -> Iterator[List[Document]]:
+        """Yield the pages of each PDF in order, parsing files in parallel"""
+        _prefetch(paths)
+
+        # Starting worker processes costs more than parsing a few files
+        cpus = os.cpu_count() or 1
+        if len(paths) < MIN_PARALLEL_FILES or cpus < 2:
+            for path in paths:
+                yield _load_one(path)
+            return
+
+        # Parse PDFs in parallel, one file per task. Only a few files are in
+        # flight at once so parsed pages never pile up ahead of the consumer.
+        # Workers are never forked: the caller may already run threads and
+        # have torch loaded, where fork() can deadlock.
+        workers = min(cpus, len(paths))
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            # Import the parser once in the server rather than in every worker
+            context.set_forkserver_preload(["langchain_document_processor"])
+        else:
+            context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+        remaining = iter(paths)
+        pending = deque()
+        try:
+            for path in remaining:
+                pending.append(executor.submit(_load_one, path))
+                if len(pending) >= 2 * workers:
+                    break
+
+            while pending:
+                pages = pending.popleft().result()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.append(executor.submit(_load_one, next_path))
+                yield pages
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def load_documents(self, directory_path: str) -> List[Document]:
+        """Load all PDF documents from directory using LangChain"""
+        paths = self._pdf_paths(directory_path)
+
+        documents = []
+        for pages in self._iter_pages(paths):
+            documents.extend(pages)
 
         print(f"📄 Loaded {len(documents)} pages from PDFs")
         return documents
 
+    def _split_page(self, page: Document) -> List[Document]:
+        """Split a single page that is longer than chunk_size"""
+        if self.splitter == "rust":
+            return [
+                Document(page_content=text, metadata=dict(page.metadata))
+                for text in self.rust_splitter.chunks(page.page_content)
+            ]
+        if self.splitter == "fast":
+            return [
+                Document(page_content=text, metadata=dict(page.metadata))
+                for text in _fast_recursive_split(
+                    page.page_content,
+                    self.chunk_size,
+                    self.chunk_overlap,
+                    self.separators,
+                )
+            ]
+        return self.text_splitter.split_documents([page])
+
     def split_documents(self, documents: List[Document]) -> List[Document]:
         """Split documents into smaller chunks using LangChain"""
-        chunks = self.text_splitter.split_documents(documents)
+        chunks = self._split(documents)
+        print(f"📝 Split into {len(chunks)} chunks")
+        return chunks
+
+    def _split(self, documents: List[Document], start_index: int = 0) -> List[Document]:
+        """Split pages and number the chunks from ``start_index``"""
+        chunks = []
+        for page in documents:
+            if len(page.page_content) <= self.chunk_size:
+                # Page already fits in one chunk, skip the splitter but strip
+                # and copy it like the splitter would
+                text = page.page_content.strip()
+                if text:
+                    chunks.append(
+                        Document(page_content=text, metadata=dict(page.metadata))
+                    )
+            else:
+                chunks.extend(self._split_page(page))
 
         # Enhance metadata for better retrieval
-        for i, chunk in enumerate(chunks):
+        for i, chunk in enumerate(chunks, start_index):
             chunk.metadata.update(
                 {
                     "chunk_index": i,
@@ -49,11 +268,135 @@ class LangChainDocumentProcessor:
                 }
             )
 
-        print(f"📝 Split into {len(chunks)} chunks")
         return chunks
 
+    def deduplicate_chunks(
+        self,
+        chunks: List[Document],
+        seen: Optional[Dict[str, Optional[Document]]] = None,
+    ) -> List[Document]:
+        """
+        Drop chunks whose text was already seen
+
+        The sources of dropped duplicates are recorded on the kept chunk as
+        a "; "-separated ``dup_sources`` string (Chroma metadata must be
+        scalar). Pass the same ``seen`` dict to deduplicate across calls;
+        digests mapped to None are dropped without recording their source.
+        """
+        if seen is None:
+            seen = {}
+
+        unique = []
+        for chunk in chunks:
+            digest = _digest(chunk.page_content)
+            if digest not in seen:
+                seen[digest] = chunk
+                unique.append(chunk)
+                continue
+
+            original = seen[digest]
+            if original is None:
+                continue
+
+            # Record each other source once
+            source = chunk.metadata.get("source")
+            if not source or source == original.metadata.get("source"):
+                continue
+            previous = original.metadata.get("dup_sources")
+            if not previous:
+                original.metadata["dup_sources"] = str(source)
+            elif str(source) not in previous.split("; "):
+                original.metadata["dup_sources"] = f"{previous}; {source}"
+
+        return unique
+
     def process_documents(self, directory_path: str) -> List[Document]:
         """Complete document processing pipeline"""
         documents = self.load_documents(directory_path)
         chunks = self.split_documents(documents)
-        return chunks
+        unique = self.deduplicate_chunks(chunks)
+
+        if len(unique) < len(chunks):
+            print(f"♻️ Skipped {len(chunks) - len(unique)} duplicate chunks")
+        return unique
+
+    def iter_chunk_batches(
+        self, directory_path: str, batch_size: int = 256
+    ) -> Iterator[List[Document]]:
+        """
+        Streaming version of process_documents
+
+        PDFs are parsed by a background producer while the caller splits,
+        deduplicates and consumes earlier files, so parsing overlaps with
+        embedding. Yields lists of at most ``batch_size`` unique chunks.
+        Duplicates found after their original chunk was yielded are still
+        dropped, but their ``dup_sources`` are not recorded.
+        """
+        paths = self._pdf_paths(directory_path)
+        pages_queue = queue.Queue(maxsize=32)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pages_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            pages_iter = self._iter_pages(paths)
+            try:
+                for pages in pages_iter:
+                    if not put(pages):
+                        break
+            except Exception as e:
+                put(e)
+            finally:
+                pages_iter.close()
+                put(done)
+
+        seen = {}
+
+        def forget(chunks: List[Document]):
+            # Keep only digests of handed-off chunks so they can be freed
+            for chunk in chunks:
+                seen[_digest(chunk.page_content)] = None
+
+        batch = []
+        page_count = chunk_count = unique_count = 0
+
+        with ThreadPoolExecutor(max_workers=1) as producer:
+            producer.submit(produce)
+            try:
+                while True:
+                    item = pages_queue.get()
+                    if item is done:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+
+                    chunks = self._split(item, start_index=chunk_count)
+                    unique = self.deduplicate_chunks(chunks, seen)
+                    page_count += len(item)
+                    chunk_count += len(chunks)
+                    unique_count += len(unique)
+
+                    batch.extend(unique)
+                    while len(batch) >= batch_size:
+                        out, batch = batch[:batch_size], batch[batch_size:]
+                        forget(out)
+                        yield out
+
+                if batch:
+                    forget(batch)
+                    yield batch
+            finally:
+                stop.set()
+
+        print(f"📄 Loaded {page_count} pages from PDFs")
+        print(f"📝 Split into {chunk_count} chunks")
+        if unique_count < chunk_count:
+            print(f"♻️ Skipped {chunk_count - unique_count} duplicate chunks")
@@ -3,34 +3,246 @@ LangChain-based embedding function using the same Sentence Transformers model
 Maintains compatibility with existing embeddings
 """
 
-from typing import List
-from langchain_community.embeddings.sentence_transformer import (
-    SentenceTransformerEmbeddings,
-)
+import hashlib
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
+
+# Default location of the persistent embedding cache
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "langchain_rag")
+
+# Bumped whenever the stored vector format changes (v1: normalized float32)
+EMBEDDING_FORMAT_VERSION = 1
+
+# Default cap on cached vectors (~150MB for 384-dim models)
+DEFAULT_CACHE_ENTRIES = 100_000
+
+# Name of the model that loaded successfully on a previous run
+MODEL_CHOICE_FILE = os.path.join(DEFAULT_CACHE_DIR, "model")
+
+
+class EmbeddingCache:
+    """
+    SQLite key/value store of embedding vectors keyed by content hash
+
+    Holds at most ``max_entries`` vectors, dropping the least recently
+    written ones. Call clear() or delete the file to reset it.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+    ):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "embeddings.sqlite")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> dict:
+        """Return a {key: vector} dict for the keys present in the cache"""
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def set_many(self, items: List[Tuple[str, List[float]]]):
+        """Store (key, vector) pairs as raw float32 bytes"""
+        if not items:
+            return
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes())
+            for key, vector in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+
+            # REPLACE assigns a new rowid, so the lowest rowids are the oldest
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY rowid LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every cached vector"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
 
 
 class LangChainEmbeddingFunction:
     """LangChain wrapper for SentenceTransformer embeddings"""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        batch_size: int = 256,
+        precision: Optional[str] = None,
+    ):
         """
         Initialize with the same free embedding model used in v0.2
+
+        Document vectors are cached on disk under ``cache_dir`` (pass None
+        to disable).
+        ``precision`` is "fp32", "fp16" or "bf16"; by default fp16 is used on
+        GPU and fp32 on CPU.
         """
         print(f"Loading LangChain embedding model: {model_name}")
-        self.embeddings = SentenceTransformerEmbeddings(model_name=model_name)
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        self._model = SentenceTransformer(model_name, device=device)
+
+        if precision is None:
+            precision = "fp16" if device == "cuda" else "fp32"
+        if precision == "fp16":
+            self._model.half()
+        elif precision == "bf16":
+            self._model.to(torch.bfloat16)
+        elif precision != "fp32":
+            raise ValueError(f"Unsupported precision: {precision}")
+
         self._model_name = model_name
+        self.batch_size = batch_size
+        self.precision = precision
+        self._cache = EmbeddingCache(cache_dir) if cache_dir else None
+
+        # Per-instance memo of exact repeated queries
+        self._embed_query_cached = lru_cache(maxsize=512)(self._embed_query_impl)
+
+    def _key(self, text: str) -> str:
+        """
+        Cache key namespaced by model, precision and vector format, so
+        vectors from a different configuration are never reused
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return (
+            f"{self._model_name}/{self.precision}/v{EMBEDDING_FORMAT_VERSION}/{digest}"
+        )
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        """Run the encoder in batches of ``batch_size`` texts"""
+        if not texts:
+            return []
+        vectors = self._model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return vectors.astype(np.float32).tolist()
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Embed a list of documents"""
-        return self.embeddings.embed_documents(texts)
+        """Embed a list of documents, encoding only texts missing from the cache"""
+        if self._cache is None:
+            return self._encode(texts)
+
+        keys = [self._key(text) for text in texts]
+        cached = self._cache.get_many(keys)
+
+        # Encode each distinct miss once, even if repeated within the batch
+        misses = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in misses:
+                misses[key] = text
+
+        if misses:
+            vectors = self._encode(list(misses.values()))
+            new_items = list(zip(misses.keys(), vectors))
+            self._cache.set_many(new_items)
+            cached.update(new_items)
+
+        return [cached[key] for key in keys]
 
     def embed_query(self, text: str) -> List[float]:
         """Embed a single query"""
-        return self.embeddings.embed_query(text)
+        return list(self._embed_query_cached(text))
 
+    def _embed_query_impl(self, text: str) -> Tuple[float, ...]:
+        # Queries only use the in-process memo, not the disk cache;
+        # tuples keep the memoized vectors immutable
+        return tuple(self._encode([text])[0])
 
+
+def _dir_size(path: str) -> int:
+    """Total size in bytes of the files under a directory"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def _is_cached_locally(model_name: str) -> bool:
+    """Check whether a model is already downloaded, so loading needs no network"""
+    cache_root = os.path.join(os.path.expanduser("~"), ".cache")
+    st_home = os.getenv(
+        "SENTENCE_TRANSFORMERS_HOME",
+        os.path.join(cache_root, "torch", "sentence_transformers"),
+    )
+    hf_home = os.getenv("HF_HOME", os.path.join(cache_root, "huggingface"))
+    hub_cache = os.getenv("HF_HUB_CACHE", os.path.join(hf_home, "hub"))
+
+    candidates = [
+        os.path.join(st_home, model_name),
+        os.path.join(st_home, f"sentence-transformers_{model_name}"),
+        os.path.join(hub_cache, f"models--sentence-transformers--{model_name}"),
+    ]
+    return any(
+        os.path.isdir(path) and _dir_size(path) > 0 for path in candidates
+    )
+
+
+def _read_model_choice() -> Optional[str]:
+    try:
+        with open(MODEL_CHOICE_FILE, encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _write_model_choice(model_name: str):
+    try:
+        os.makedirs(os.path.dirname(MODEL_CHOICE_FILE), exist_ok=True)
+        with open(MODEL_CHOICE_FILE, "w", encoding="utf-8") as f:
+            f.write(model_name)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=1)
 def get_embedding_function():
-    """Return LangChain-compatible embedding function"""
+    """Return LangChain-compatible embedding function, loaded once per process"""
     # Try better models first, fallback to lighter ones
     model_priority = [
         "all-MiniLM-L12-v2",  # Better quality, ~130MB
@@ -38,13 +250,28 @@ def get_embedding_function():
         "paraphrase-MiniLM-L3-v2",  # Fallback, ~60MB
     ]
 
-    for model_name in model_priority:
+    # Try the model chosen last time, then already-downloaded models, and
+    # only then models that would have to be fetched from the network
+    remembered = _read_model_choice()
+    candidates = [name for name in model_priority if name == remembered]
+    candidates += [
+        name
+        for name in model_priority
+        if name not in candidates and _is_cached_locally(name)
+    ]
+    candidates += [name for name in model_priority if name not in candidates]
+
+    for model_name in candidates:
         try:
-            return LangChainEmbeddingFunction(model_name)
+            embedding_function = LangChainEmbeddingFunction(model_name)
         except Exception as e:
             print(f"Failed to load {model_name}: {e}")
             continue
 
+        if model_name != remembered:
+            _write_model_choice(model_name)
+        return embedding_function
+
     # Ultimate fallback
     print("Using fallback embedding model")
     return LangChainEmbeddingFunction("all-MiniLM-L6-v2")
@@ -4,7 +4,11 @@ Integrates with LangChain's OpenAI implementation
 """
 
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
+
+import httpx
+from openai import APIError
 from langchain_community.llms import OpenAI
 from langchain_community.chat_models import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
@@ -30,31 +34,60 @@ class LangChainOpenAIClient:
             api_key=api_key, model=model, temperature=temperature, max_tokens=1000
         )
 
-    def generate(self, prompt: str, system_message: Optional[str] = None) -> str:
-        """Generate response using LangChain's ChatOpenAI"""
-        try:
-            messages = []
-
-            # Add system message if provided
-            if system_message:
-                messages.append(SystemMessage(content=system_message))
-            else:
-                messages.append(
-                    SystemMessage(
-                        content="You are a helpful assistant that answers questions based only on the provided context."
-                    )
+    def _build_messages(
+        self, prompt: str, system_message: Optional[str] = None
+    ) -> list:
+        """Build the chat messages for a prompt"""
+        messages = []
+
+        # Add system message if provided
+        if system_message:
+            messages.append(SystemMessage(content=system_message))
+        else:
+            messages.append(
+                SystemMessage(
+                    content="You are a helpful assistant that answers questions based only on the provided context."
                 )
+            )
+
+        # Add user message
+        messages.append(HumanMessage(content=prompt))
+        return messages
+
+    def generate(self, prompt: str, system_message: Optional[str] = None) -> str:
+        """
+        Generate response using LangChain's ChatOpenAI
 
-            # Add user message
-            messages.append(HumanMessage(content=prompt))
+        API and transport errors are raised so callers can tell an
+        unreachable API apart from other failures
+        """
+        try:
+            messages = self._build_messages(prompt, system_message)
 
             # Generate response
             response = self.llm.invoke(messages)
             return response.content.strip()
 
+        except (APIError, httpx.HTTPError):
+            raise
         except Exception as e:
             return f"❌ Error calling OpenAI API: {e}"
 
+    def generate_stream(
+        self, prompt: str, system_message: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Stream the response token by token
+
+        Errors are raised rather than yielded as text, since tokens may
+        already have been consumed when the stream fails
+        """
+        messages = self._build_messages(prompt, system_message)
+
+        for chunk in self.llm.stream(messages):
+            if chunk.content:
+                yield chunk.content
+
     def is_available(self) -> bool:
         """Check if OpenAI API is accessible"""
         try:
@@ -66,7 +99,17 @@ class LangChainOpenAIClient:
             return False
 
 
-def get_openai_client(model: str = "gpt-4.1-nano") -> LangChainOpenAIClient:
+@lru_cache(maxsize=8)
+def _cached_client(
+    api_key: str, model: str, temperature: float
+) -> LangChainOpenAIClient:
+    """Reuse clients (and their HTTP connection pools) across queries"""
+    return LangChainOpenAIClient(api_key, model, temperature)
+
+
+def get_openai_client(
+    model: str = "gpt-4.1-nano", temperature: float = 0.1
+) -> LangChainOpenAIClient:
     """Get LangChain OpenAI client with API key from environment"""
     # Get API key from .env or environment variable
     api_key = os.getenv("OPENAI_API_KEY")
@@ -78,4 +121,4 @@ def get_openai_client(model: str = "gpt-4.1-nano") -> LangChainOpenAIClient:
             "Get your API key from: https://platform.openai.com/api-keys"
         )
 
-    return LangChainOpenAIClient(api_key, model)
+    return _cached_client(api_key, model, temperature)
@@ -5,46 +5,252 @@ Maintains compatibility with existing data while using LangChain components
 
 import os
 import shutil
-from typing import List, Optional
+from typing import Iterable, List, Optional
+
+import numpy as np
 from langchain_community.vectorstores import Chroma
 from langchain.schema import Document
 from langchain_embeddings import get_embedding_function
 
+# Above this many chunks the in-memory matrix is served by FAISS if installed,
+# otherwise searches go through Chroma
+MATRIX_SEARCH_LIMIT = 200_000
+
+# Number of chunks embedded and written to Chroma per insert
+INSERT_BATCH_SIZE = 512
+
+# Half-precision copy of the search matrix kept next to the Chroma files
+MATRIX_CACHE_FILE = "_matrix.fp16.npz"
+
+# Rows of the int8 matrix upcast to float32 at a time when scoring
+INT8_SCORE_BLOCK = 65_536
+
+
+def _quantize_int8(matrix: np.ndarray) -> tuple:
+    """Quantize rows to int8 with one float32 scale per row"""
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.round(matrix / scales[:, np.newaxis]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
 
 class LangChainVectorStore:
     """Vector store using LangChain's Chroma integration"""
 
     def __init__(
-        self, persist_directory: str = "chroma", collection_name: str = "documents"
+        self,
+        persist_directory: str = "chroma",
+        collection_name: str = "documents",
+        matrix_search_limit: int = MATRIX_SEARCH_LIMIT,
+        int8_matrix: bool = False,
     ):
+        """
+        With ``int8_matrix`` the in-memory search matrix is stored as int8
+        with per-row scales, using a quarter of the float32 memory
+        """
         self.persist_directory = persist_directory
         self.collection_name = collection_name
-        self.embedding_function = get_embedding_function()
+        self.matrix_search_limit = matrix_search_limit
+        self.int8_matrix = int8_matrix
+        self._embedding_function = None
         self._vectorstore = None
 
+        # In-memory search index, built lazily from the Chroma collection
+        self._index_loaded = False
+        self._matrix: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._faiss_index = None
+        self._docs: List[Document] = []
+
+    @property
+    def embedding_function(self):
+        """Shared embedding function, loaded on first use"""
+        if self._embedding_function is None:
+            self._embedding_function = get_embedding_function()
+        return self._embedding_function
+
+    def _reset_index(self):
+        """Drop the in-memory index so it is rebuilt on the next search"""
+        self._index_loaded = False
+        self._matrix = None
+        self._scales = None
+        self._faiss_index = None
+        self._docs = []
+
+    def _read_matrix(self, collection) -> tuple:
+        """
+        Return (matrix, documents, metadatas) for the whole collection
+
+        Embeddings come from the fp16 sidecar file when it matches the
+        collection's ids, otherwise from Chroma (refreshing the sidecar)
+        """
+        cache_path = os.path.join(self.persist_directory, MATRIX_CACHE_FILE)
+
+        matrix = None
+        if os.path.exists(cache_path):
+            # Compare ids alone first, so documents are fetched only once
+            ids = list(collection.get(include=[])["ids"])
+            try:
+                with np.load(cache_path, allow_pickle=False) as cached:
+                    if cached["ids"].tolist() == ids:
+                        matrix = cached["matrix"].astype(np.float32)
+            except Exception as e:
+                print(f"⚠️ Ignoring unreadable matrix cache: {e}")
+
+        if matrix is not None:
+            data = collection.get(include=["documents", "metadatas"])
+            if list(data["ids"]) == ids:
+                return matrix, data["documents"], data["metadatas"]
+
+        data = collection.get(include=["embeddings", "documents", "metadatas"])
+        matrix = np.asarray(data["embeddings"], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+
+        # Write to a temporary file and swap it in, so concurrent readers
+        # never see a partially written sidecar
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    matrix=matrix.astype(np.float16),
+                    ids=np.asarray(data["ids"], dtype=str),
+                )
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️ Could not write matrix cache: {e}")
+
+        return matrix, data["documents"], data["metadatas"]
+
+    def _load_index(self):
+        """Preload all embeddings into an L2-normalized float32 matrix"""
+        self._index_loaded = True
+        collection = self._vectorstore._collection
+
+        count = collection.count()
+        if count == 0:
+            return
+
+        faiss = None
+        if count > self.matrix_search_limit:
+            try:
+                import faiss
+            except ImportError:
+                print(f"⚠️ {count} chunks exceed in-memory limit, searching via Chroma")
+                return
+
+        matrix, texts, metadatas = self._read_matrix(collection)
+
+        self._docs = [
+            Document(page_content=text or "", metadata=metadata or {})
+            for text, metadata in zip(texts, metadatas)
+        ]
+
+        if faiss is not None:
+            self._faiss_index = faiss.IndexFlatIP(matrix.shape[1])
+            self._faiss_index.add(matrix)
+        elif self.int8_matrix:
+            self._matrix, self._scales = _quantize_int8(matrix)
+        else:
+            self._matrix = matrix
+
+    def _search_index(self, embedding: List[float], k: int) -> Optional[List[tuple]]:
+        """
+        Search the in-memory index for (document, cosine similarity) pairs,
+        or return None if it is unavailable
+        """
+        if not self._index_loaded:
+            self._load_index()
+
+        if not self._docs:
+            return None
+
+        q = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm > 0:
+            q /= norm
+
+        if self._faiss_index is not None:
+            scores, idx = self._faiss_index.search(q[np.newaxis, :], k)
+            return [
+                (self._docs[i], float(score))
+                for i, score in zip(idx[0], scores[0])
+                if i >= 0
+            ]
+
+        if self._scales is not None:
+            # Upcast one block of rows at a time, so a query never holds a
+            # float32 copy of the whole matrix
+            scores = np.empty(len(self._matrix), dtype=np.float32)
+            for start in range(0, len(self._matrix), INT8_SCORE_BLOCK):
+                end = start + INT8_SCORE_BLOCK
+                block = self._matrix[start:end].astype(np.float32)
+                scores[start:end] = (block @ q) * self._scales[start:end]
+        else:
+            scores = self._matrix @ q
+
+        # O(n) selection of the k best, then sort only those k
+        k = min(k, len(scores))
+        if k < len(scores):
+            idx = np.argpartition(-scores, k)[:k]
+        else:
+            idx = np.arange(len(scores))
+        idx = idx[np.argsort(-scores[idx])]
+        return [(self._docs[i], float(scores[i])) for i in idx]
+
     def clear_database(self):
         """Clear the existing database"""
         if os.path.exists(self.persist_directory):
             shutil.rmtree(self.persist_directory)
             print("✅ Database cleared")
+        self._reset_index()
 
     def create_vectorstore(self, documents: List[Document]) -> Chroma:
         """Create a new vector store from documents"""
         if not documents:
             raise ValueError("No documents provided")
 
-        # Create the vector store
-        vectorstore = Chroma.from_documents(
-            documents=documents,
-            embedding=self.embedding_function,
-            persist_directory=self.persist_directory,
-            collection_name=self.collection_name,
-        )
+        vectorstore = self._open_chroma()
+        self._insert(vectorstore, documents)
 
         print(f"✅ Created vector store with {len(documents)} documents")
         self._vectorstore = vectorstore
+        self._reset_index()
         return vectorstore
 
+    def create_vectorstore_from_batches(
+        self, batches: Iterable[List[Document]]
+    ) -> int:
+        """
+        Create a vector store from a stream of document batches, opening
+        Chroma once. Returns the number of documents added.
+        """
+        vectorstore = self._open_chroma()
+        total = 0
+        for batch in batches:
+            self._insert(vectorstore, batch)
+            total += len(batch)
+
+        self._vectorstore = vectorstore
+        self._reset_index()
+        return total
+
+    def _open_chroma(self) -> Chroma:
+        return Chroma(
+            persist_directory=self.persist_directory,
+            embedding_function=self.embedding_function,
+            collection_name=self.collection_name,
+        )
+
+    @staticmethod
+    def _insert(vectorstore: Chroma, documents: List[Document]):
+        # Insert in batches, so embeddings are materialized and committed a
+        # batch at a time
+        for start in range(0, len(documents), INSERT_BATCH_SIZE):
+            vectorstore.add_documents(documents[start : start + INSERT_BATCH_SIZE])
+
     def get_vectorstore(self) -> Optional[Chroma]:
         """Get existing vector store"""
         if not os.path.exists(self.persist_directory):
@@ -52,12 +258,9 @@ class LangChainVectorStore:
             return None
 
         try:
-            vectorstore = Chroma(
-                persist_directory=self.persist_directory,
-                embedding_function=self.embedding_function,
-                collection_name=self.collection_name,
-            )
+            vectorstore = self._open_chroma()
             self._vectorstore = vectorstore
+            self._reset_index()
             return vectorstore
 
         except Exception as e:
@@ -73,6 +276,7 @@ class LangChainVectorStore:
             raise ValueError("No vector store available. Create one first.")
 
         self._vectorstore.add_documents(documents)
+        self._reset_index()
         print(f"✅ Added {len(documents)} documents to vector store")
 
     def similarity_search(self, query: str, k: int = 5) -> List[Document]:
@@ -83,16 +287,41 @@ class LangChainVectorStore:
         if self._vectorstore is None:
             return []
 
-        results = self._vectorstore.similarity_search(query, k=k)
-        return results
+        embedding = self.embedding_function.embed_query(query)
+        return self.similarity_search_by_vector(embedding, k=k)
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 5
+    ) -> List[Document]:
+        """Search for documents similar to an already computed query embedding"""
+        if self._vectorstore is None:
+            self._vectorstore = self.get_vectorstore()
+
+        if self._vectorstore is None:
+            return []
+
+        results = self._search_index(embedding, k)
+        if results is None:
+            return self._vectorstore.similarity_search_by_vector(embedding, k=k)
+        return [doc for doc, _ in results]
 
     def similarity_search_with_score(self, query: str, k: int = 5) -> List[tuple]:
-        """Search for similar documents with relevance scores"""
+        """
+        Search for similar documents with relevance scores
+
+        Scores are Chroma's default squared L2 distances; for the normalized
+        in-memory index this is 2 - 2 * cosine similarity
+        """
         if self._vectorstore is None:
             self._vectorstore = self.get_vectorstore()
 
         if self._vectorstore is None:
             return []
 
-        results = self._vectorstore.similarity_search_with_score(query, k=k)
-        return results
+        embedding = self.embedding_function.embed_query(query)
+        results = self._search_index(embedding, k)
+        if results is None:
+            return self._vectorstore.similarity_search_by_vector_with_relevance_scores(
+                embedding, k=k
+            )
+        return [(doc, 2.0 - 2.0 * score) for doc, score in results]
@@ -3,7 +3,6 @@ LangChain RAG database population script
 """
 
 import argparse
-from advanced_langchain_rag import AdvancedLangChainRAG
 
 
 def main():
@@ -27,6 +26,9 @@ def main():
 
     args = parser.parse_args()
 
+    # Import lazily so --help and argument errors return instantly
+    from advanced_langchain_rag import AdvancedLangChainRAG
+
     # Initialize RAG system
     rag_system = AdvancedLangChainRAG(
         data_path=args.data_path,
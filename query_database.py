@@ -4,7 +4,6 @@ LangChain RAG query script
 
 import argparse
 import json
-from advanced_langchain_rag import AdvancedLangChainRAG
 
 
 def main():
@@ -28,11 +27,21 @@ def main():
     parser.add_argument(
         "--json-output", action="store_true", help="Output results as JSON"
     )
+    parser.add_argument(
+        "--int8-matrix",
+        action="store_true",
+        help="Keep the in-memory search matrix as int8 to save memory",
+    )
 
     args = parser.parse_args()
 
+    # Import lazily so --help and argument errors return instantly
+    from advanced_langchain_rag import AdvancedLangChainRAG
+
     # Initialize RAG system
-    rag_system = AdvancedLangChainRAG(chroma_path=args.chroma_path)
+    rag_system = AdvancedLangChainRAG(
+        chroma_path=args.chroma_path, int8_matrix=args.int8_matrix
+    )
 
     # Query the system
     try:
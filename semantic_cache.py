@@ -0,0 +1,157 @@
+"""
+Semantic query cache
+Reuses RAG results for repeated or near-duplicate questions
+"""
+
+import copy
+import io
+import json
+import os
+from typing import List, Optional
+
+import numpy as np
+
+# Factor applied to every entry's hit score on each insert, so entries that
+# were popular long ago eventually make room for new questions
+HIT_DECAY = 0.9
+
+
+class SemanticCache:
+    """Bounded cache mapping query embeddings to query results"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        threshold: float = 0.97,
+        max_entries: int = 256,
+    ):
+        """
+        Entries whose cosine similarity to a new query is at least
+        ``threshold`` are reused. When full, the entry with the lowest
+        decayed hit score is evicted, least recently used first on ties.
+        Stored results omit the "context" text to keep the file small.
+        """
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+
+        self._embeddings = np.empty((0, 0), dtype=np.float32)
+        self._namespaces: List[str] = []
+        self._results: List[dict] = []
+        self._scores: List[float] = []
+        self._last_used: List[int] = []
+        self._clock = 0
+
+        if path and os.path.exists(path):
+            try:
+                self._load()
+            except Exception as e:
+                print(f"⚠️ Ignoring unreadable query cache: {e}")
+                self._reset()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        q = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        return q / norm if norm > 0 else q
+
+    def lookup(self, embedding, namespace: str = "") -> Optional[dict]:
+        """
+        Return a copy of the cached result closest to the query, if close
+        enough. The copy has no "context" key.
+        """
+        if not self._results:
+            return None
+
+        q = self._normalize(embedding)
+        if q.shape[0] != self._embeddings.shape[1]:
+            return None
+
+        sims = self._embeddings @ q
+        sims[np.asarray(self._namespaces) != namespace] = -np.inf
+
+        best = int(np.argmax(sims))
+        if sims[best] < self.threshold:
+            return None
+
+        self._clock += 1
+        self._scores[best] += 1.0
+        self._last_used[best] = self._clock
+        return copy.deepcopy(self._results[best])
+
+    def add(self, embedding, result: dict, namespace: str = ""):
+        """Store a result, evicting the coldest entry when full"""
+        q = self._normalize(embedding)
+
+        # A different embedding model invalidates every cached entry
+        if self._results and q.shape[0] != self._embeddings.shape[1]:
+            self._reset()
+
+        self._scores = [score * HIT_DECAY for score in self._scores]
+
+        if len(self._results) >= self.max_entries:
+            # lexsort sorts by the last key first: score, then last use
+            evict = int(np.lexsort((self._last_used, self._scores))[0])
+            self._embeddings = np.delete(self._embeddings, evict, axis=0)
+            del self._namespaces[evict]
+            del self._results[evict]
+            del self._scores[evict]
+            del self._last_used[evict]
+
+        if self._results:
+            self._embeddings = np.vstack([self._embeddings, q])
+        else:
+            self._embeddings = q[np.newaxis, :]
+        self._clock += 1
+        self._namespaces.append(namespace)
+        self._results.append({k: v for k, v in result.items() if k != "context"})
+        # New entries start level with a fresh hit so they can outlive
+        # entries whose hits have decayed
+        self._scores.append(1.0)
+        self._last_used.append(self._clock)
+
+        if self.path:
+            self._save()
+
+    def clear(self):
+        """Drop all entries, including the persisted copy"""
+        self._reset()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _reset(self):
+        self._embeddings = np.empty((0, 0), dtype=np.float32)
+        self._namespaces = []
+        self._results = []
+        self._scores = []
+        self._last_used = []
+        self._clock = 0
+
+    def _save(self):
+        """Persist the cache as an .npz file for warm starts"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            embeddings=self._embeddings,
+            namespaces=np.asarray(self._namespaces, dtype=str),
+            scores=np.asarray(self._scores, dtype=np.float64),
+            last_used=np.asarray(self._last_used, dtype=np.int64),
+            results=np.asarray(json.dumps(self._results, default=str)),
+        )
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_path, self.path)
+
+    def _load(self):
+        with np.load(self.path, allow_pickle=False) as data:
+            self._embeddings = data["embeddings"].astype(np.float32)
+            self._namespaces = data["namespaces"].tolist()
+            self._scores = data["scores"].tolist()
+            self._last_used = data["last_used"].tolist()
+            self._clock = max(self._last_used, default=0)
+            self._results = json.loads(str(data["results"]))
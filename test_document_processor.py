@@ -0,0 +1,132 @@
+"""
+Tests for document splitting and deduplication
+"""
+
+import random
+
+from langchain.schema import Document
+from langchain_document_processor import (
+    LangChainDocumentProcessor,
+    _fast_recursive_split,
+)
+
+SEPARATORS = ["\n\n", "\n", " ", ""]
+
+
+def _random_text(rng: random.Random, n_words: int) -> str:
+    """Unique words joined by a mix of separators"""
+    parts = []
+    for i in range(n_words):
+        parts.append(f"w{i}")
+        parts.append(rng.choice([" ", " ", " ", "\n", "\n\n"]))
+    return "".join(parts)
+
+
+def test_fast_split_respects_size_and_covers_text():
+    """Chunks never exceed size, and without overlap they cover all text"""
+    rng = random.Random(0)
+    for _ in range(200):
+        text = _random_text(rng, rng.randint(0, 300))
+        size = rng.randint(10, 200)
+
+        chunks = _fast_recursive_split(text, size, 0, SEPARATORS)
+
+        assert all(0 < len(chunk) <= size for chunk in chunks)
+        assert " ".join(chunks).split() == text.split()
+
+
+def test_fast_split_overlaps_on_word_boundaries():
+    """Consecutive chunks share whole words only"""
+    rng = random.Random(1)
+    for _ in range(200):
+        text = _random_text(rng, rng.randint(20, 300))
+        words = set(text.split())
+        size = rng.randint(20, 200)
+        overlap = rng.randint(1, size // 2)
+
+        chunks = _fast_recursive_split(text, size, overlap, SEPARATORS)
+
+        assert all(len(chunk) <= size for chunk in chunks)
+        for chunk in chunks:
+            assert set(chunk.split()) <= words
+        # Every word still appears, in order, once overlaps are removed
+        seen = []
+        for chunk in chunks:
+            for word in chunk.split():
+                if word not in seen:
+                    seen.append(word)
+        assert seen == text.split()
+
+
+def test_fast_split_overlaps_across_newlines():
+    """Overlap also starts after newlines, not only after spaces"""
+    chunks = _fast_recursive_split("aaa\nbbb\nccc\nddd\neee\nfff", 8, 4, SEPARATORS)
+    assert chunks == ["aaa\nbbb", "bbb\nccc", "ccc\nddd", "ddd\neee", "eee\nfff"]
+
+
+def test_fast_split_hard_cuts_long_words():
+    """Text without separators is cut at exactly size characters"""
+    chunks = _fast_recursive_split("x" * 25, 10, 0, SEPARATORS)
+    assert chunks == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_split_documents_copies_small_pages():
+    """Pages that fit are stripped copies; the input pages are not mutated"""
+    processor = LangChainDocumentProcessor(chunk_size=100, chunk_overlap=10)
+    page = Document(page_content="  Hello\n", metadata={"source": "a.pdf"})
+
+    chunks = processor.split_documents([page, Document(page_content=" \n")])
+
+    assert len(chunks) == 1
+    assert chunks[0] is not page
+    assert chunks[0].page_content == "Hello"
+    assert chunks[0].metadata["chunk_length"] == 5
+    assert page.metadata == {"source": "a.pdf"}
+
+
+def test_deduplicate_records_dup_sources():
+    """Duplicates are dropped and their sources accumulate on the original"""
+    processor = LangChainDocumentProcessor()
+    chunks = [
+        Document(page_content="footer", metadata={"source": "a.pdf"}),
+        Document(page_content="body", metadata={"source": "a.pdf"}),
+        Document(page_content="footer", metadata={"source": "b.pdf"}),
+        Document(page_content="footer", metadata={"source": "c.pdf"}),
+    ]
+
+    unique = processor.deduplicate_chunks(chunks)
+
+    assert [c.page_content for c in unique] == ["footer", "body"]
+    assert unique[0].metadata["dup_sources"] == "b.pdf; c.pdf"
+    assert "dup_sources" not in unique[1].metadata
+
+
+def test_deduplicate_lists_each_source_once():
+    """Repeats from the same file, or from the kept chunk's file, are not listed"""
+    processor = LangChainDocumentProcessor()
+    chunks = [
+        Document(page_content="footer", metadata={"source": "a.pdf"}),
+        Document(page_content="footer", metadata={"source": "a.pdf"}),
+        Document(page_content="footer", metadata={"source": "b.pdf"}),
+        Document(page_content="footer", metadata={"source": "b.pdf"}),
+    ]
+
+    unique = processor.deduplicate_chunks(chunks)
+
+    assert unique[0].metadata["dup_sources"] == "b.pdf"
+
+
+def test_deduplicate_across_calls():
+    """A shared seen dict deduplicates across batches"""
+    processor = LangChainDocumentProcessor()
+    seen = {}
+    first = processor.deduplicate_chunks(
+        [Document(page_content="x", metadata={"source": "a.pdf"})], seen
+    )
+    second = processor.deduplicate_chunks(
+        [Document(page_content="x", metadata={"source": "b.pdf"})], seen
+    )
+
+    assert len(first) == 1
+    assert second == []
+    assert first[0].metadata["dup_sources"] == "b.pdf"
@@ -0,0 +1,93 @@
+"""
+Tests for the semantic query cache
+"""
+
+import numpy as np
+from semantic_cache import SemanticCache
+
+
+def _vector(*values):
+    return np.asarray(values, dtype=np.float32)
+
+
+def test_hit_and_miss():
+    """Near-identical queries hit, unrelated ones miss"""
+    cache = SemanticCache(threshold=0.97)
+    cache.add(_vector(1, 0, 0), {"answer": "a", "sources": []}, "m:5")
+
+    assert cache.lookup(_vector(1, 0.01, 0), "m:5")["answer"] == "a"
+    assert cache.lookup(_vector(0, 1, 0), "m:5") is None
+
+
+def test_namespace_isolation():
+    """Results are only reused for the same model and k"""
+    cache = SemanticCache()
+    cache.add(_vector(1, 0, 0), {"answer": "a", "sources": []}, "m:5")
+
+    assert cache.lookup(_vector(1, 0, 0), "m:3") is None
+    assert cache.lookup(_vector(1, 0, 0), "other:5") is None
+
+
+def test_lookup_returns_copy():
+    """Mutating a hit does not change the cached entry"""
+    cache = SemanticCache()
+    cache.add(_vector(1, 0, 0), {"answer": "a", "sources": ["x.pdf"]})
+
+    hit = cache.lookup(_vector(1, 0, 0))
+    hit["answer"] = "changed"
+    hit["sources"].append("y.pdf")
+
+    assert cache.lookup(_vector(1, 0, 0)) == {"answer": "a", "sources": ["x.pdf"]}
+
+
+def test_eviction_admits_new_entries():
+    """A full cache keeps admitting new questions even if old ones were hit"""
+    cache = SemanticCache(max_entries=2)
+    cache.add(_vector(1, 0, 0), {"answer": "a"})
+    cache.add(_vector(0, 1, 0), {"answer": "b"})
+    for _ in range(3):
+        cache.lookup(_vector(1, 0, 0))
+        cache.lookup(_vector(0, 1, 0))
+
+    questions = [_vector(0, 0, 1), _vector(1, 1, 0), _vector(0, 1, 1)]
+    for i, q in enumerate(questions):
+        cache.add(q, {"answer": str(i)})
+        assert len(cache) == 2
+        assert cache.lookup(q)["answer"] == str(i)
+
+
+def test_eviction_prefers_cold_entries():
+    """The least-hit entry is evicted before a frequently hit one"""
+    cache = SemanticCache(max_entries=2)
+    cache.add(_vector(1, 0, 0), {"answer": "hot"})
+    cache.add(_vector(0, 1, 0), {"answer": "cold"})
+    for _ in range(5):
+        cache.lookup(_vector(1, 0, 0))
+
+    cache.add(_vector(0, 0, 1), {"answer": "new"})
+
+    assert cache.lookup(_vector(1, 0, 0))["answer"] == "hot"
+    assert cache.lookup(_vector(0, 1, 0)) is None
+
+
+def test_save_load_round_trip(tmp_path):
+    """Entries survive a reload, without the stored context"""
+    path = str(tmp_path / "_qcache.npz")
+    cache = SemanticCache(path)
+    result = {
+        "answer": "a",
+        "sources": [{"index": 1, "content": "c", "metadata": {"page": 2}}],
+        "context": "long context",
+    }
+    cache.add(_vector(1, 0, 0), result, "m:5")
+
+    reloaded = SemanticCache(path)
+    cached = reloaded.lookup(_vector(1, 0, 0), "m:5")
+
+    assert len(reloaded) == 1
+    assert cached["answer"] == "a"
+    assert cached["sources"] == result["sources"]
+    assert "context" not in cached
+
+    reloaded.clear()
+    assert len(SemanticCache(path)) == 0
@@ -0,0 +1,92 @@
+"""
+Tests for the in-memory search index of the vector store
+"""
+
+import numpy as np
+from langchain.schema import Document
+from langchain_vectorstore import LangChainVectorStore, _quantize_int8
+
+
+def _normalized(rng: np.random.Generator, n: int, d: int) -> np.ndarray:
+    matrix = rng.standard_normal((n, d)).astype(np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def _store_with_matrix(tmp_path, matrix: np.ndarray, int8: bool = False):
+    """Vector store whose index is preloaded, without Chroma or a model"""
+    store = LangChainVectorStore(persist_directory=str(tmp_path))
+    store._index_loaded = True
+    store._docs = [Document(page_content=str(i)) for i in range(len(matrix))]
+    if int8:
+        store._matrix, store._scales = _quantize_int8(matrix)
+    else:
+        store._matrix = matrix
+    return store
+
+
+def test_int8_scores_close_to_float32():
+    """Quantized scores stay within a small error of float32 scores"""
+    rng = np.random.default_rng(0)
+    matrix = _normalized(rng, 500, 384)
+    q = _normalized(rng, 1, 384)[0]
+
+    quantized, scales = _quantize_int8(matrix)
+    approx = (quantized @ q) * scales
+
+    assert quantized.dtype == np.int8
+    assert np.max(np.abs(approx - matrix @ q)) < 0.02
+
+
+def test_top_k_is_sorted_best_first(tmp_path):
+    """The in-memory search returns the true top k in descending order"""
+    rng = np.random.default_rng(1)
+    matrix = _normalized(rng, 1000, 32)
+    q = _normalized(rng, 1, 32)[0]
+    store = _store_with_matrix(tmp_path, matrix)
+
+    results = store._search_index(q.tolist(), k=5)
+
+    expected = np.argsort(-(matrix @ q))[:5]
+    assert [doc.page_content for doc, _ in results] == [str(i) for i in expected]
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_top_k_larger_than_collection(tmp_path):
+    """Asking for more results than documents returns all of them, sorted"""
+    rng = np.random.default_rng(2)
+    matrix = _normalized(rng, 3, 8)
+    store = _store_with_matrix(tmp_path, matrix)
+
+    results = store._search_index(matrix[1].tolist(), k=10)
+
+    assert len(results) == 3
+    assert results[0][0].page_content == "1"
+
+
+def test_int8_search_matches_float32(tmp_path):
+    """The int8 index finds the same nearest document"""
+    rng = np.random.default_rng(3)
+    matrix = _normalized(rng, 200, 64)
+    store = _store_with_matrix(tmp_path, matrix, int8=True)
+
+    for i in (0, 57, 199):
+        results = store._search_index(matrix[i].tolist(), k=1)
+        assert results[0][0].page_content == str(i)
+
+
+def test_int8_blocked_scores_match_unblocked(tmp_path, monkeypatch):
+    """Scoring the int8 matrix in row blocks gives the same scores"""
+    rng = np.random.default_rng(4)
+    matrix = _normalized(rng, 250, 16)
+    q = _normalized(rng, 1, 16)[0]
+    store = _store_with_matrix(tmp_path, matrix, int8=True)
+    expected = store._search_index(q.tolist(), k=250)
+
+    monkeypatch.setattr("langchain_vectorstore.INT8_SCORE_BLOCK", 64)
+    blocked = store._search_index(q.tolist(), k=250)
+
+    assert [doc.page_content for doc, _ in blocked] == [
+        doc.page_content for doc, _ in expected
+    ]
+    assert np.allclose([s for _, s in blocked], [s for _, s in expected])